@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+from html import escape
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+import nba_dashboard as dashboard
+
+LIVE_LINK_TEMPLATE = """    <div class="card" style="text-align: center;">
+        Player comparison, points timeline and career journey views are available on the
+        <a href="__LIVE_URL__">live dashboard</a>.
+    </div>
+"""
+
+SHELL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>NBA Player Statistics Dashboard</title>
+    <script src="plotly.min.js"></script>
+    <style>
+        body {
+            font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: __BACKGROUND__;
+            color: __TEXT__;
+        }
+        h1 {
+            text-align: center;
+            color: __ACCENT__;
+            font-size: 2.5em;
+            padding: 20px;
+            border-bottom: 4px solid __PRIMARY__;
+            background-color: __CARD_BG__;
+            border-radius: 10px;
+        }
+        h2 {
+            text-align: center;
+            color: __ACCENT__;
+            padding: 10px;
+            border-bottom: 3px solid __PRIMARY__;
+        }
+        .card {
+            background-color: __CARD_BG__;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
+            padding: 20px;
+            margin-bottom: 20px;
+        }
+        .row {
+            display: flex;
+            justify-content: space-between;
+        }
+        .row .card {
+            width: 49%;
+            box-sizing: border-box;
+        }
+        select {
+            width: 100%;
+            padding: 8px;
+            margin-bottom: 15px;
+            border-radius: 5px;
+        }
+        .filters {
+            display: flex;
+            gap: 2%;
+        }
+        a {
+            color: __ACCENT__;
+        }
+    </style>
+</head>
+<body>
+    <h1>🏀 NBA Player Statistics Dashboard</h1>
+
+__LIVE_LINK__
+    <div class="card">
+        <h2>Team Dynasty Explorer</h2>
+        <select id="legacy-metric"></select>
+        <div id="team-legacy-graph" style="height: 800px;"></div>
+    </div>
+
+    <div class="row">
+        <div class="card">
+            <h2>College to NBA Pipeline</h2>
+            <select id="college-metric"></select>
+            <div id="college-pipeline-chart" style="height: 500px;"></div>
+        </div>
+        <div class="card">
+            <h2>Position Analysis</h2>
+            <div class="filters">
+                <select id="position-stat"></select>
+                <select id="position-decade"></select>
+                <select id="position-team"></select>
+            </div>
+            <div id="position-distribution-chart" style="height: 500px;"></div>
+        </div>
+    </div>
+
+    <script>
+        const figureCache = {};
+
+        function fillSelect(select, options, value, placeholder) {
+            if (placeholder) {
+                select.add(new Option(placeholder, ''));
+            }
+            options.forEach(option => select.add(new Option(option.label, option.value)));
+            select.value = value;
+        }
+
+        function showFigure(target, path) {
+            const figure = figureCache[path]
+                ? Promise.resolve(figureCache[path])
+                : fetch(path).then(response => response.json());
+            figure.then(fig => {
+                figureCache[path] = fig;
+                Plotly.react(target, fig.data, fig.layout);
+            });
+        }
+
+        fetch('manifest.json').then(response => response.json()).then(manifest => {
+            const legacy = document.getElementById('legacy-metric');
+            const college = document.getElementById('college-metric');
+            const stat = document.getElementById('position-stat');
+            const decade = document.getElementById('position-decade');
+            const team = document.getElementById('position-team');
+
+            fillSelect(legacy, manifest.options.stat, 'PTS');
+            fillSelect(college, manifest.options.college, 'count');
+            fillSelect(stat, manifest.options.stat, 'PTS');
+            fillSelect(decade, manifest.options.decade, '', 'Select decade');
+            fillSelect(team, manifest.options.team, '', 'Select team');
+
+            const updateLegacy = () => showFigure('team-legacy-graph', manifest.figures.legacy[legacy.value]);
+            const updateCollege = () => showFigure('college-pipeline-chart', manifest.figures.college[college.value]);
+            const updatePosition = () => showFigure('position-distribution-chart',
+                manifest.figures.position[[stat.value, decade.value, team.value].join('|')]);
+
+            legacy.addEventListener('change', updateLegacy);
+            college.addEventListener('change', updateCollege);
+            [stat, decade, team].forEach(select => select.addEventListener('change', updatePosition));
+
+            updateLegacy();
+            updateCollege();
+            updatePosition();
+        });
+    </script>
+</body>
+</html>
+"""
+
+def slugify(value):
+    """
+    Turn an option value into a safe file name component.
+    """
+    if value is None:
+        return 'all'
+    return ''.join(char if char.isalnum() else '-' for char in str(value)).strip('-').lower()
+
+def write_figure(output_dir, relative_path, fig):
+    """
+    Write a figure as compact JSON and return its path relative to the site root.
+    """
+    path = os.path.join(output_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(pio.to_json(fig, pretty=False))
+    return relative_path.replace(os.sep, '/')
+
+def render_shell(live_url=None):
+    """
+    Fill the HTML shell with the dashboard's colors and, if given, the live app link.
+    """
+    live_link = LIVE_LINK_TEMPLATE.replace('__LIVE_URL__', escape(live_url)) if live_url else ''
+    replacements = {
+        '__BACKGROUND__': dashboard.NBA_COLORS['background'],
+        '__CARD_BG__': dashboard.NBA_COLORS['card_bg'],
+        '__TEXT__': dashboard.NBA_COLORS['text'],
+        '__ACCENT__': dashboard.NBA_COLORS['accent'],
+        '__PRIMARY__': dashboard.NBA_COLORS['primary'],
+        '__LIVE_LINK__': live_link,
+    }
+    shell = SHELL_TEMPLATE
+    for placeholder, value in replacements.items():
+        shell = shell.replace(placeholder, value)
+    return shell
+
+def export_static_site(output_dir, live_url=None):
+    """
+    Render every legacy, college and position figure combination to static JSON
+    plus an HTML shell that switches between them client-side.
+    These views have inputs small and finite enough to prerender every combination;
+    player-specific views (comparison, timeline, career arc) stay on the live app.
+    """
+    stats = [option['value'] for option in dashboard.stat_options]
+    college_metrics = [option['value'] for option in dashboard.college_metric_options]
+    decades = [None] + [option['value'] for option in dashboard.decade_options]
+    teams = [None] + [option['value'] for option in dashboard.team_options]
+
+    figures = {'legacy': {}, 'college': {}, 'position': {}}
+
+    for metric in stats:
+        figures['legacy'][metric] = write_figure(
+            output_dir, os.path.join('figures', 'legacy', f'{slugify(metric)}.json'),
+            dashboard.team_legacy_figure(metric))
+
+    for metric in college_metrics:
+        figures['college'][metric] = write_figure(
+            output_dir, os.path.join('figures', 'college', f'{slugify(metric)}.json'),
+            dashboard.college_pipeline_figure(metric))
+
+    for stat in stats:
+        for decade in decades:
+            for team in teams:
+                # Key matches the select values in the shell ('' for "no filter")
+                key = '|'.join([stat, str(decade or ''), team or ''])
+                figures['position'][key] = write_figure(
+                    output_dir,
+                    os.path.join('figures', 'position', slugify(stat), slugify(decade), f'{slugify(team)}.json'),
+                    dashboard.position_distribution_figure(stat, decade, team))
+
+    manifest = {
+        'options': {
+            'stat': dashboard.stat_options,
+            'college': dashboard.college_metric_options,
+            'decade': [{'label': option['label'], 'value': str(option['value'])}
+                       for option in dashboard.decade_options],
+            'team': dashboard.team_options,
+        },
+        'figures': figures,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    with open(os.path.join(output_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_shell(live_url))
+
+    return sum(len(view) for view in figures.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Prerender the dashboard's finite views for static hosting.")
+    parser.add_argument('--output-dir', default='static_site',
+                        help="Directory to write the snapshot into (default: static_site)")
+    parser.add_argument('--live-url',
+                        help="URL of the live dashboard for player-specific views (omitted from the page if not given)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"Exporting static snapshot to {args.output_dir}...")
+    count = export_static_site(args.output_dir, args.live_url)
+    print(f"Wrote {count} figures to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import nba_dashboard as dashboard
+
+# Compares response sizes of the Dash update endpoint for a full figure
+# (initial load) versus a partial update (dropdown change).
+
+def callback_response_size(client, outputs, inputs, state, changed_prop_id):
+    """
+    Post a callback request like the browser does and return the response size in bytes.
+    outputs, inputs and state are lists of (component id, property[, value]) tuples.
+    """
+    output_ids = [f'{output_id}.{prop}' for output_id, prop in outputs]
+    payload = {
+        'output': output_ids[0] if len(outputs) == 1 else '..' + '...'.join(output_ids) + '..',
+        'outputs': ({'id': outputs[0][0], 'property': outputs[0][1]} if len(outputs) == 1 else
+                    [{'id': output_id, 'property': prop} for output_id, prop in outputs]),
+        'inputs': [{'id': input_id, 'property': prop, 'value': value}
+                   for input_id, prop, value in inputs],
+        'changedPropIds': [changed_prop_id] if changed_prop_id else [],
+        'state': [{'id': state_id, 'property': prop, 'value': value}
+                  for state_id, prop, value in state],
+    }
+    response = client.post('/_dash-update-component', json=payload)
+    if response.status_code != 200:
+        raise RuntimeError(f"Callback for {output_ids[0]} failed with status {response.status_code}")
+    return len(response.get_data())
+
+def main():
+    dashboard.app._setup_server()
+    client = dashboard.server.test_client()
+
+    legacy_outputs = [('team-legacy-graph', 'figure'), ('team-legacy-rendered', 'data')]
+    legacy_state = [('team-legacy-rendered', 'data', True)]
+    position_outputs = [('position-distribution-chart', 'figure')]
+
+    interactions = [
+        (legacy_outputs, [('legacy-metric-dropdown', 'value', 'REB')], legacy_state,
+         'legacy-metric-dropdown.value'),
+        (legacy_outputs, [('legacy-metric-dropdown', 'value', 'AST')], legacy_state,
+         'legacy-metric-dropdown.value'),
+        (position_outputs,
+         [('position-stat-dropdown', 'value', 'REB'), ('position-decade-dropdown', 'value', None),
+          ('position-team-dropdown', 'value', None)], [],
+         'position-stat-dropdown.value'),
+        (position_outputs,
+         [('position-stat-dropdown', 'value', 'AST'), ('position-decade-dropdown', 'value', 1990),
+          ('position-team-dropdown', 'value', 'Lakers')], [],
+         'position-stat-dropdown.value'),
+    ]
+
+    print(f"{'Interaction':<60} {'Full':>10} {'Patch':>10} {'Saved':>10}")
+    for outputs, inputs, state, changed_prop_id in interactions:
+        full_size = callback_response_size(client, outputs, inputs, state, None)
+        patch_size = callback_response_size(client, outputs, inputs, state, changed_prop_id)
+        label = f"{outputs[0][0]} <- " + ', '.join(f"{value}" for _, _, value in inputs if value is not None)
+        saved = full_size - patch_size
+        print(f"{label:<60} {full_size:>10,} {patch_size:>10,} {saved:>9,} ({saved / full_size:.0%})")
+
+if __name__ == "__main__":
+    main()
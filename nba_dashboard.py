@@ -1,12 +1,32 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, dcc, html, Input, Output
+from dash import Dash, Patch, ctx, dash_table, dcc, html, Input, Output, State
+from flask import Response, abort, jsonify, request
 import numpy as np
+import cProfile
+import functools
+import heapq
+import hmac
+import io
+import json
+import math
 import os
+import re
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
+# Parquet export is optional; the rest of the dashboard runs without pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 # Initialize logging
 def log_debug(message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -123,6 +143,32 @@ try:
 except ValueError as e:
     print(f"Data type conversion error: {e}")
 
+def position_filter_mask(selected_stat=None, selected_decade=None, selected_team=None, selected_position=None):
+    """
+    Build a boolean row mask for the Position Analysis filters.
+    Shared by the position callback and the export route so both see the same rows.
+    """
+    mask = df['POSITION'].notna() & (df['POSITION'] != '')
+    
+    if selected_stat:
+        mask &= df[selected_stat].notna()
+    
+    if selected_decade is not None:
+        mask &= (df['FROM_YEAR'] >= selected_decade) & (df['FROM_YEAR'] < selected_decade + 10)
+    
+    if selected_team:
+        mask &= df['TEAM_NAME'] == selected_team
+    
+    if selected_position:
+        if '-' in selected_position:
+            # A combined position like 'G-F' matches the raw value exactly
+            mask &= df['POSITION'] == selected_position
+        else:
+            # Match the standardized position shown in the chart (e.g. 'G' also covers 'G-F')
+            mask &= df['POSITION'].str.split('-').str[0] == selected_position
+    
+    return mask.to_numpy()
+
 # Create player options for dropdowns
 player_options = [{'label': f"{row['PLAYER_FIRST_NAME']} {row['PLAYER_LAST_NAME']}", 
                   'value': f"{row['PLAYER_FIRST_NAME']} {row['PLAYER_LAST_NAME']}"} 
@@ -134,6 +180,51 @@ max_year = df['FROM_YEAR'].max()
 decade_options = [{'label': f"{decade}s", 'value': decade} 
                  for decade in range(min_year // 10 * 10, (max_year // 10 * 10) + 10, 10)]
 
+# Create team options for filtering
+team_options = [{'label': team, 'value': team} for team in sorted(df['TEAM_NAME'].unique())]
+
+# Stat options shared by the Team Dynasty and Position Analysis dropdowns
+stat_options = [
+    {'label': '🏀 Points', 'value': 'PTS'},
+    {'label': '🔄 Rebounds', 'value': 'REB'},
+    {'label': '👥 Assists', 'value': 'AST'}
+]
+
+college_metric_options = [
+    {'label': '👥 Number of Players', 'value': 'count'},
+    {'label': '🏀 Average Points', 'value': 'PTS'},
+    {'label': '🔄 Average Rebounds', 'value': 'REB'},
+    {'label': '👥 Average Assists', 'value': 'AST'}
+]
+
+# Leaderboard table data, with the player name combined into one sortable column
+LEADERBOARD_COLUMNS = ['PLAYER', 'TEAM_NAME', 'POSITION', 'COLLEGE', 'FROM_YEAR', 'TO_YEAR', 'PTS', 'REB', 'AST']
+LEADERBOARD_NUMERIC_COLUMNS = ['FROM_YEAR', 'TO_YEAR', 'PTS', 'REB', 'AST']
+LEADERBOARD_PAGE_SIZE = 25
+
+leaderboard_df = df.assign(
+    PLAYER=(df['PLAYER_FIRST_NAME'].fillna('') + ' ' + df['PLAYER_LAST_NAME'].fillna('')).str.strip()
+)[LEADERBOARD_COLUMNS].reset_index(drop=True)
+
+def build_sort_index(series):
+    """
+    Presort a column once at startup.
+    Returns {direction: (order, rank)} where order lists row positions in sorted order
+    (missing values always last) and rank maps each row position to its place in that order.
+    """
+    ascending = series.sort_values(kind='mergesort', na_position='last').index.to_numpy()
+    valid_count = int(series.notna().sum())
+    descending = np.concatenate([ascending[:valid_count][::-1], ascending[valid_count:]])
+    
+    sort_index = {}
+    for direction, order in (('asc', ascending), ('desc', descending)):
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        sort_index[direction] = (order, rank)
+    return sort_index
+
+LEADERBOARD_SORT_INDEX = {column: build_sort_index(leaderboard_df[column]) for column in LEADERBOARD_COLUMNS}
+
 # Layout of the dashboard
 app.layout = html.Div([
     # Dashboard Header
@@ -216,15 +307,13 @@ app.layout = html.Div([
                style={'color': NBA_COLORS['secondary'], 'marginBottom': '10px'}),
         dcc.Dropdown(
             id='legacy-metric-dropdown',
-            options=[
-                {'label': '🏀 Points', 'value': 'PTS'},
-                {'label': '🔄 Rebounds', 'value': 'REB'},
-                {'label': '👥 Assists', 'value': 'AST'}
-            ],
+            options=stat_options,
             value='PTS',
             style=DROPDOWN_STYLE
         ),
-        dcc.Graph(id='team-legacy-graph', style={'height': '800px'})
+        dcc.Graph(id='team-legacy-graph', style={'height': '800px'}),
+        # Whether this browser's Team Dynasty graph holds a full sunburst that can be patched
+        dcc.Store(id='team-legacy-rendered', data=False)
     ], style=CARD_STYLE),
 
     # College Pipeline & Position Distribution (Side by Side)
@@ -233,12 +322,7 @@ app.layout = html.Div([
             html.H2("College to NBA Pipeline", style=HEADER_STYLE),
             dcc.Dropdown(
                 id='college-metric-dropdown',
-                options=[
-                    {'label': '👥 Number of Players', 'value': 'count'},
-                    {'label': '🏀 Average Points', 'value': 'PTS'},
-                    {'label': '🔄 Average Rebounds', 'value': 'REB'},
-                    {'label': '👥 Average Assists', 'value': 'AST'}
-                ],
+                options=college_metric_options,
                 value='count',
                 style={
                     'width': '100%',
@@ -255,11 +339,7 @@ app.layout = html.Div([
             html.Div([
                 dcc.Dropdown(
                     id='position-stat-dropdown',
-                    options=[
-                        {'label': '🏀 Points', 'value': 'PTS'},
-                        {'label': '🔄 Rebounds', 'value': 'REB'},
-                        {'label': '👥 Assists', 'value': 'AST'}
-                    ],
+                    options=stat_options,
                     value='PTS',
                     style={
                         'width': '32%',
@@ -281,7 +361,7 @@ app.layout = html.Div([
                 ),
                 dcc.Dropdown(
                     id='position-team-dropdown',
-                    options=[{'label': team, 'value': team} for team in sorted(df['TEAM_NAME'].unique())],
+                    options=team_options,
                     placeholder="Select team",
                     style={
                         'width': '32%',
@@ -294,6 +374,43 @@ app.layout = html.Div([
         ], style={'width': '49%', 'display': 'inline-block', 'verticalAlign': 'top', **CARD_STYLE}),
     ], style={'display': 'flex', 'justifyContent': 'space-between', 'marginBottom': '20px'}),
 
+    # Player Leaderboard
+    html.Div([
+        html.H2("Player Leaderboard", style=HEADER_STYLE),
+        html.I("Sort by any column and filter with expressions like > 20 or Lakers", 
+               style={'color': NBA_COLORS['secondary'], 'marginBottom': '10px'}),
+        dash_table.DataTable(
+            id='leaderboard-table',
+            columns=[{'name': column, 'id': column,
+                      'type': 'numeric' if column in LEADERBOARD_NUMERIC_COLUMNS else 'text'}
+                     for column in LEADERBOARD_COLUMNS],
+            page_current=0,
+            page_size=LEADERBOARD_PAGE_SIZE,
+            page_action='custom',
+            sort_action='custom',
+            sort_mode='single',
+            sort_by=[{'column_id': 'PTS', 'direction': 'desc'}],
+            filter_action='custom',
+            filter_query='',
+            style_header={
+                'backgroundColor': NBA_COLORS['primary'],
+                'color': NBA_COLORS['text'],
+                'fontWeight': 'bold'
+            },
+            style_filter={
+                'backgroundColor': NBA_COLORS['hover'],
+                'color': NBA_COLORS['text']
+            },
+            style_cell={
+                'backgroundColor': NBA_COLORS['card_bg'],
+                'color': NBA_COLORS['text'],
+                'border': f'1px solid {NBA_COLORS["grid"]}',
+                'textAlign': 'left',
+                'padding': '5px'
+            }
+        )
+    ], style=CARD_STYLE),
+
 ], style={
     'fontFamily': '"Helvetica Neue", Helvetica, Arial, sans-serif',
     'backgroundColor': NBA_COLORS['background'],
@@ -302,11 +419,138 @@ app.layout = html.Div([
     'color': NBA_COLORS['text']
 })
 
+# Opt-in callback profiling: set NBA_DASHBOARD_PROFILE=1 or toggle it through /admin/profiling.
+# Calls slower than the threshold get a cProfile dump (open with snakeviz or flameprof)
+# and a line in slow_calls.jsonl in the profile directory.
+def read_env_number(name, default, convert, minimum):
+    """
+    Read a numeric setting from the environment.
+    Unparseable, non-finite or too-small values are logged and replaced by the default.
+    """
+    raw_value = os.environ.get(name, '').strip()
+    if not raw_value:
+        return default
+    
+    try:
+        value = convert(raw_value)
+    except ValueError:
+        value = None
+    
+    if value is None or not math.isfinite(value) or value < minimum:
+        log_debug(f"WARNING: ignoring invalid {name}={raw_value!r}, using {default}")
+        return default
+    return value
+
+PROFILING = {
+    'enabled': os.environ.get('NBA_DASHBOARD_PROFILE', '').lower() in ('1', 'true', 'yes'),
+    'threshold_ms': read_env_number('NBA_DASHBOARD_PROFILE_THRESHOLD_MS', 500.0, float, 0),
+    'output_dir': os.environ.get('NBA_DASHBOARD_PROFILE_DIR', 'profiles'),
+}
+SLOW_CALL_LOG_SIZE = 50
+
+# Disk usage caps: the oldest profiles are deleted, and slow_calls.jsonl is rotated to
+# slow_calls.jsonl.1 (replacing the previous one) once it reaches the size limit
+# At least one file is always kept, so the profile a record points to is never pruned
+PROFILE_FILE_LIMIT = read_env_number('NBA_DASHBOARD_PROFILE_MAX_FILES', 200, int, 1)
+SLOW_CALL_JSONL_MAX_BYTES = 1024 * 1024
+
+# Min-heap of (elapsed_ms, sequence, record) holding the slowest calls seen so far,
+# plus a rolling window of the most recent slow calls
+slow_calls = []
+recent_slow_calls = deque(maxlen=SLOW_CALL_LOG_SIZE)
+slow_calls_lock = threading.Lock()
+slow_call_sequence = 0
+
+def write_slow_call_files(func_name, timestamp, elapsed_ms, profiler, record):
+    """
+    Write the profile dump and jsonl line for a slow call, pruning old files to stay within the caps.
+    Called with slow_calls_lock held so concurrent slow calls do not prune each other's files.
+    """
+    output_dir = PROFILING['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    
+    profile_path = os.path.join(output_dir, f"{timestamp}_{func_name}_{elapsed_ms:.0f}ms.prof")
+    profiler.dump_stats(profile_path)
+    record['profile'] = profile_path
+    
+    # File names start with the timestamp, so name order is age order
+    profile_files = sorted(name for name in os.listdir(output_dir) if name.endswith('.prof'))
+    for name in profile_files[:max(0, len(profile_files) - PROFILE_FILE_LIMIT)]:
+        os.remove(os.path.join(output_dir, name))
+    
+    log_path = os.path.join(output_dir, 'slow_calls.jsonl')
+    if os.path.exists(log_path) and os.path.getsize(log_path) >= SLOW_CALL_JSONL_MAX_BYTES:
+        os.replace(log_path, log_path + '.1')
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+
+def record_slow_call(func_name, args, elapsed_ms, profiler):
+    """
+    Dump the profile of a slow callback call and add it to the slow-call logs.
+    """
+    global slow_call_sequence
+    
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    record = {
+        'timestamp': timestamp,
+        'callback': func_name,
+        'elapsed_ms': round(elapsed_ms, 1),
+        'inputs': [repr(arg)[:200] for arg in args],
+        'profile': None,
+    }
+    
+    with slow_calls_lock:
+        try:
+            write_slow_call_files(func_name, timestamp, elapsed_ms, profiler, record)
+        except OSError as e:
+            log_debug(f"Could not write profile for {func_name}: {str(e)}")
+        
+        recent_slow_calls.append(record)
+        slow_call_sequence += 1
+        entry = (elapsed_ms, slow_call_sequence, record)
+        if len(slow_calls) < SLOW_CALL_LOG_SIZE:
+            heapq.heappush(slow_calls, entry)
+        else:
+            heapq.heappushpop(slow_calls, entry)
+    
+    log_debug(f"Slow callback {func_name}: {elapsed_ms:.0f}ms (profile: {record['profile']})")
+
+def profiled(func):
+    """
+    Wrap a callback so it is profiled while PROFILING['enabled'] is set.
+    When profiling is off the only cost is a dictionary lookup per call.
+    Profiling never fails the wrapped call; if the profiler is busy the call runs unprofiled.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not PROFILING['enabled']:
+            return func(*args, **kwargs)
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows only one active profiler per interpreter; when another
+            # callback (or tool) holds it, run this call unprofiled rather than failing it
+            return func(*args, **kwargs)
+        
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms >= PROFILING['threshold_ms']:
+                record_slow_call(func.__name__, args, elapsed_ms, profiler)
+    
+    return wrapper
+
 # Callback for updating the radar chart
 @app.callback(
     Output('radar-chart', 'figure'),
     [Input('comparison-player-dropdown', 'value')]
 )
+@profiled
 def update_radar_chart(selected_players):
     if not selected_players or len(selected_players) > 3:
         return go.Figure()
@@ -358,6 +602,7 @@ def update_radar_chart(selected_players):
     Output('line-chart', 'figure'),
     [Input('player-dropdown', 'value')]
 )
+@profiled
 def update_line_chart(selected_player):
     if selected_player is None:
         return go.Figure()
@@ -384,6 +629,7 @@ def update_line_chart(selected_player):
     Output('career-arc-timeline', 'figure'),
     [Input('career-player-dropdown', 'value')]
 )
+@profiled
 def update_career_arc(selected_player):
     if selected_player is None:
         return go.Figure()
@@ -405,12 +651,8 @@ def update_career_arc(selected_player):
     )
     return fig
 
-# New callback for College Pipeline Analyzer
-@app.callback(
-    Output('college-pipeline-chart', 'figure'),
-    [Input('college-metric-dropdown', 'value')]
-)
-def update_college_pipeline(selected_metric):
+# College Pipeline Analyzer figure
+def college_pipeline_figure(selected_metric):
     try:
         # Create empty figure as fallback
         fig = go.Figure()
@@ -530,36 +772,24 @@ def update_college_pipeline(selected_metric):
         )
         return fig
 
-# New callback for Position-Based Distributions
+# New callback for College Pipeline Analyzer
 @app.callback(
-    Output('position-distribution-chart', 'figure'),
-    [Input('position-stat-dropdown', 'value'),
-     Input('position-decade-dropdown', 'value'),
-     Input('position-team-dropdown', 'value')]
+    Output('college-pipeline-chart', 'figure'),
+    [Input('college-metric-dropdown', 'value')]
 )
-def update_position_distribution(selected_stat, selected_decade, selected_team):
-    # Start with a copy of the dataframe
-    filtered_df = df.copy()
-    
-    # Filter out rows with missing positions or selected stat
-    filtered_df = filtered_df[
-        filtered_df['POSITION'].notna() &
-        (filtered_df['POSITION'] != '') &
-        filtered_df[selected_stat].notna()
-    ]
+@profiled
+def update_college_pipeline(selected_metric):
+    return college_pipeline_figure(selected_metric)
+
+# Position-Based Distributions figure
+def position_distribution_figure(selected_stat, selected_decade, selected_team):
+    # Filter out rows with missing positions or selected stat, then apply decade/team
+    filtered_df = df.loc[position_filter_mask(selected_stat, selected_decade, selected_team),
+                         ['POSITION', selected_stat]].copy()
     
     # Standardize position format (take first letter if multiple positions)
     filtered_df['POSITION'] = filtered_df['POSITION'].str.split('-').str[0]
     
-    if selected_decade:
-        filtered_df = filtered_df[
-            (filtered_df['FROM_YEAR'] >= selected_decade) &
-            (filtered_df['FROM_YEAR'] < selected_decade + 10)
-        ]
-    
-    if selected_team:
-        filtered_df = filtered_df[filtered_df['TEAM_NAME'] == selected_team]
-    
     # Check if we have any data after filtering
     if filtered_df.empty:
         fig = go.Figure()
@@ -616,12 +846,33 @@ def update_position_distribution(selected_stat, selected_decade, selected_team):
     
     return fig
 
-# New callback for Team Legacy Graph
+# New callback for Position-Based Distributions
 @app.callback(
-    Output('team-legacy-graph', 'figure'),
-    [Input('legacy-metric-dropdown', 'value')]
+    Output('position-distribution-chart', 'figure'),
+    [Input('position-stat-dropdown', 'value'),
+     Input('position-decade-dropdown', 'value'),
+     Input('position-team-dropdown', 'value')]
 )
-def update_team_legacy(selected_metric):
+@profiled
+def update_position_distribution(selected_stat, selected_decade, selected_team):
+    fig = position_distribution_figure(selected_stat, selected_decade, selected_team)
+    
+    # A stat change keeps the layout, so only the traces and titles need to go over the wire.
+    # If any stat has no rows for these filters the chart may be showing the "no data" layout
+    # instead, so fall back to sending the whole figure.
+    if ctx.triggered_id != 'position-stat-dropdown' or not all(
+            position_filter_mask(option['value'], selected_decade, selected_team).any()
+            for option in stat_options):
+        return fig
+    
+    patch = Patch()
+    patch['data'] = [trace.to_plotly_json() for trace in fig.data]
+    patch['layout']['title']['text'] = fig.layout.title.text
+    patch['layout']['yaxis']['title']['text'] = fig.layout.yaxis.title.text
+    return patch
+
+# Team Legacy Graph figure
+def team_legacy_figure(selected_metric):
     try:
         # Create a copy of the dataframe
         legacy_df = df.copy()
@@ -710,6 +961,327 @@ def update_team_legacy(selected_metric):
         )
         return fig
 
+# New callback for Team Legacy Graph
+@app.callback(
+    [Output('team-legacy-graph', 'figure'),
+     Output('team-legacy-rendered', 'data')],
+    [Input('legacy-metric-dropdown', 'value')],
+    [State('team-legacy-rendered', 'data')]
+)
+@profiled
+def update_team_legacy(selected_metric, sunburst_rendered):
+    fig = team_legacy_figure(selected_metric)
+    is_sunburst = bool(fig.data) and fig.data[0].type == 'sunburst'
+    
+    # The sunburst's ids, parents and layout do not depend on the metric, so a metric change
+    # only sends the new values, labels and title - provided this browser already shows a
+    # full sunburst rather than the error figure
+    if ctx.triggered_id != 'legacy-metric-dropdown' or not (is_sunburst and sunburst_rendered):
+        return fig, is_sunburst
+    
+    patch = Patch()
+    patch['data'][0]['values'] = fig.data[0].values
+    patch['data'][0]['labels'] = fig.data[0].labels
+    patch['layout']['title']['text'] = fig.layout.title.text
+    return patch, True
+
+# Leaderboard filtering follows the DataTable filter_query syntax, e.g. "{PTS} > 20 && {TEAM_NAME} contains Lakers"
+FILTER_OPERATORS = {
+    '>=': 'ge', 'ge': 'ge',
+    '<=': 'le', 'le': 'le',
+    '<': 'lt', 'lt': 'lt',
+    '>': 'gt', 'gt': 'gt',
+    '!=': 'ne', 'ne': 'ne',
+    '=': 'eq', 'eq': 'eq',
+    'contains': 'contains',
+    'datestartswith': 'datestartswith',
+}
+
+FILTER_PART_PATTERN = re.compile(
+    r'^\{(?P<column>[^}]+)\}\s+(?P<case>[si]?)(?P<operator>>=|<=|!=|<|>|=|ge|le|lt|gt|ne|eq|contains|datestartswith)\s+(?P<value>.+)$'
+)
+
+# Unary operators take no value, e.g. "{COLLEGE} is blank"
+UNARY_FILTER_PART_PATTERN = re.compile(r'^\{(?P<column>[^}]+)\}\s+(?P<operator>is (?:blank|nil|num|str))$')
+
+def split_filter_part(filter_part):
+    """
+    Parse one "{column} operator value" or "{column} is ..." clause of a filter_query.
+    Returns (column, operator, value, case_insensitive) or None if the clause is not understood.
+    """
+    filter_part = filter_part.strip()
+    
+    match = UNARY_FILTER_PART_PATTERN.match(filter_part)
+    if match:
+        return match.group('column'), match.group('operator'), None, False
+    
+    match = FILTER_PART_PATTERN.match(filter_part)
+    if not match:
+        return None
+    
+    # Values stay strings here; numeric columns convert them when comparing
+    value = match.group('value').strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in ('"', "'", '`'):
+        value = value[1:-1]
+    
+    return match.group('column'), FILTER_OPERATORS[match.group('operator')], value, match.group('case') == 'i'
+
+def filter_part_mask(column, operator, value, case_insensitive):
+    """
+    Build the boolean row mask for one parsed filter_query clause.
+    """
+    series = leaderboard_df[column]
+    is_numeric = column in LEADERBOARD_NUMERIC_COLUMNS
+    
+    if operator == 'is nil':
+        return series.isna().to_numpy()
+    if operator == 'is blank':
+        return (series.isna() | (series.astype(str).str.strip() == '')).to_numpy()
+    if operator == 'is num':
+        return (series.notna() if is_numeric else pd.Series(False, index=series.index)).to_numpy()
+    if operator == 'is str':
+        return (series.notna() if not is_numeric else pd.Series(False, index=series.index)).to_numpy()
+    
+    if operator in ('contains', 'datestartswith') or not is_numeric:
+        series = series.astype(str) if is_numeric else series
+        if case_insensitive:
+            series = series.str.lower()
+            value = value.lower()
+    else:
+        try:
+            value = float(value)
+        except ValueError:
+            # A non-numeric value against a numeric column matches nothing
+            return np.zeros(len(leaderboard_df), dtype=bool)
+    
+    if operator == 'contains':
+        part_mask = series.str.contains(value, regex=False, na=False)
+    elif operator == 'datestartswith':
+        part_mask = series.str.startswith(value, na=False)
+    elif operator == 'eq':
+        part_mask = series == value
+    elif operator == 'ne':
+        part_mask = series != value
+    elif operator == 'lt':
+        part_mask = series < value
+    elif operator == 'le':
+        part_mask = series <= value
+    elif operator == 'gt':
+        part_mask = series > value
+    else:
+        part_mask = series >= value
+    
+    return part_mask.fillna(False).to_numpy(dtype=bool)
+
+def leaderboard_filter_mask(filter_query):
+    """
+    Build a boolean row mask for the leaderboard filter_query, or None when nothing is filtered.
+    """
+    mask = None
+    for filter_part in (filter_query or '').split(' && '):
+        if not filter_part.strip():
+            continue
+        
+        parsed = split_filter_part(filter_part)
+        if parsed is None or parsed[0] not in LEADERBOARD_COLUMNS:
+            # A clause we cannot evaluate (e.g. an '||' expression) matches nothing
+            # rather than being ignored, so the table never claims a filter it did not apply
+            part_mask = np.zeros(len(leaderboard_df), dtype=bool)
+        else:
+            part_mask = filter_part_mask(*parsed)
+        
+        mask = part_mask if mask is None else mask & part_mask
+    
+    return mask
+
+def select_leaderboard_page(mask, sort_by, page_current, page_size):
+    """
+    Return the row positions for one leaderboard page.
+    Unfiltered pages are a slice of the presorted index; filtered pages use a partial
+    top-N selection over the precomputed ranks, so no request ever runs a full sort.
+    """
+    start = page_current * page_size
+    end = start + page_size
+    
+    if sort_by and sort_by[0]['column_id'] in LEADERBOARD_SORT_INDEX:
+        order, rank = LEADERBOARD_SORT_INDEX[sort_by[0]['column_id']][sort_by[0]['direction']]
+    else:
+        order, rank = None, None
+    
+    if mask is None:
+        if order is None:
+            return np.arange(start, min(end, len(leaderboard_df)))
+        return order[start:end]
+    
+    positions = np.flatnonzero(mask)
+    if order is None or start >= len(positions):
+        return positions[start:end]
+    
+    # Only the first `end` matching rows need ordering; everything after the page is left unsorted
+    keys = rank[positions]
+    top_count = min(end, len(positions))
+    top = np.argpartition(keys, top_count - 1)[:top_count]
+    top = top[np.argsort(keys[top])]
+    return positions[top[start:end]]
+
+# Callback for the paginated leaderboard
+@app.callback(
+    [Output('leaderboard-table', 'data'),
+     Output('leaderboard-table', 'page_count'),
+     Output('leaderboard-table', 'page_current')],
+    [Input('leaderboard-table', 'page_current'),
+     Input('leaderboard-table', 'page_size'),
+     Input('leaderboard-table', 'sort_by'),
+     Input('leaderboard-table', 'filter_query')]
+)
+@profiled
+def update_leaderboard(page_current, page_size, sort_by, filter_query):
+    page_current = page_current or 0
+    page_size = page_size or LEADERBOARD_PAGE_SIZE
+    
+    mask = leaderboard_filter_mask(filter_query)
+    row_count = len(leaderboard_df) if mask is None else int(mask.sum())
+    page_count = max(1, -(-row_count // page_size))
+    
+    # A narrower filter can leave the current page past the end; move back to the last page
+    page_current = min(page_current, page_count - 1)
+    
+    # Only the visible page is serialized and sent to the browser
+    page_rows = leaderboard_df.iloc[select_leaderboard_page(mask, sort_by, page_current, page_size)]
+    data = page_rows.astype(object).where(page_rows.notna(), None).to_dict('records')
+    return data, page_count, page_current
+
+# Streaming export of the rows behind the Position Analysis filters
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+class _ParquetChunkSink:
+    """Write-only file object that hands pyarrow's output back in pieces."""
+    
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.position = 0
+        self.closed = False
+    
+    def write(self, data):
+        self.buffer.write(data)
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self.position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self):
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+def iter_export_chunks(row_positions, export_format):
+    """
+    Yield the selected rows of df as encoded chunks of EXPORT_CHUNK_ROWS rows.
+    Only one chunk is ever encoded at a time, so memory use does not grow with the export size.
+    """
+    chunks = (df.iloc[row_positions[start:start + EXPORT_CHUNK_ROWS]]
+              for start in range(0, len(row_positions), EXPORT_CHUNK_ROWS))
+    
+    if export_format == 'csv':
+        yield df.iloc[:0].to_csv(index=False)
+        for chunk in chunks:
+            yield chunk.to_csv(index=False, header=False)
+    
+    elif export_format == 'jsonl':
+        for chunk in chunks:
+            yield chunk.to_json(orient='records', lines=True)
+    
+    elif export_format == 'parquet':
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        sink = _ParquetChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+@server.route('/export/<export_format>')
+def export_filtered_data(export_format):
+    """
+    Stream the rows matching the Position Analysis filters.
+    Query parameters mirror the dropdowns: stat, decade, team (and optionally position).
+    """
+    if export_format not in EXPORT_FORMATS:
+        abort(404, description=f"Unknown export format: {export_format}")
+    if export_format == 'parquet' and pq is None:
+        abort(501, description="Parquet export requires pyarrow")
+    
+    selected_stat = request.args.get('stat')
+    if selected_stat and selected_stat not in [option['value'] for option in stat_options]:
+        abort(400, description=f"Unknown stat: {selected_stat}")
+    
+    selected_decade = request.args.get('decade') or None
+    if selected_decade is not None:
+        try:
+            selected_decade = int(selected_decade)
+        except ValueError:
+            abort(400, description=f"Invalid decade: {selected_decade}")
+    
+    mask = position_filter_mask(selected_stat, selected_decade,
+                                request.args.get('team'), request.args.get('position'))
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(
+        iter_export_chunks(np.flatnonzero(mask), export_format),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=nba_players.{extension}'}
+    )
+
+# Admin route for toggling profiling at runtime; disabled unless NBA_DASHBOARD_ADMIN_TOKEN is set
+@server.route('/admin/profiling', methods=['GET', 'POST'])
+def admin_profiling():
+    """
+    GET returns the profiling settings, the slowest recorded calls and the most recent slow calls.
+    POST accepts JSON or form fields 'enabled' and 'threshold_ms' to change them.
+    Requests must send the admin token in the X-Admin-Token header.
+    """
+    admin_token = os.environ.get('NBA_DASHBOARD_ADMIN_TOKEN')
+    if not admin_token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+        abort(403)
+    
+    if request.method == 'POST':
+        settings = request.get_json(silent=True) or request.form
+        if 'enabled' in settings:
+            PROFILING['enabled'] = str(settings['enabled']).lower() in ('1', 'true', 'yes')
+        if 'threshold_ms' in settings:
+            try:
+                threshold_ms = float(settings['threshold_ms'])
+            except (TypeError, ValueError):
+                threshold_ms = None
+            if threshold_ms is None or not math.isfinite(threshold_ms) or threshold_ms < 0:
+                abort(400, description=f"Invalid threshold_ms: {settings['threshold_ms']}")
+            PROFILING['threshold_ms'] = threshold_ms
+        log_debug(f"Profiling {'enabled' if PROFILING['enabled'] else 'disabled'}, "
+                  f"threshold {PROFILING['threshold_ms']}ms")
+    
+    with slow_calls_lock:
+        slowest = [record for _, _, record in sorted(slow_calls, reverse=True)]
+        recent = list(reversed(recent_slow_calls))
+    
+    return jsonify({**PROFILING, 'slowest_calls': slowest, 'recent_slow_calls': recent})
+
 if __name__ == '__main__':
     # Get port from environment variable or default to 8050
     port = int(os.environ.get('PORT', 8050))